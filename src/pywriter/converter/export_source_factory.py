@@ -29,9 +29,9 @@ class ExportSourceFactory(FileFactory):
         Raise the "Error" exception in case of error. 
         """
         __, fileExtension = os.path.splitext(sourcePath)
-        for fileClass in self._fileClasses:
-            if fileClass.EXTENSION == fileExtension:
-                sourceFile = fileClass(sourcePath, **kwargs)
-                return sourceFile, None
+        fileClass = self._extensionMap.get(fileExtension)
+        if fileClass is not None:
+            sourceFile = fileClass(sourcePath, **kwargs)
+            return sourceFile, None
 
         raise Error(f'{_("File type is not supported")}: "{norm_path(sourcePath)}".')
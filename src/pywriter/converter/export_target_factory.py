@@ -33,11 +33,11 @@ class ExportTargetFactory(FileFactory):
         """
         fileName, __ = os.path.splitext(sourcePath)
         suffix = kwargs['suffix']
-        for fileClass in self._fileClasses:
-            if fileClass.SUFFIX == suffix:
-                if suffix is None:
-                    suffix = ''
-                targetFile = fileClass(f'{fileName}{suffix}{fileClass.EXTENSION}', **kwargs)
-                return None, targetFile
+        fileClass = self._suffixMap.get(suffix)
+        if fileClass is not None:
+            if suffix is None:
+                suffix = ''
+            targetFile = fileClass(f'{fileName}{suffix}{fileClass.EXTENSION}', **kwargs)
+            return None, targetFile
 
         raise Error(f'{_("Export type is not supported")}: "{suffix}".')
@@ -21,6 +21,26 @@ class FileFactory(ABC):
         """
         self._fileClasses = fileClasses
 
+        self._extensionMap = {}
+        # key: str -- file extension
+        # value: the first class in fileClasses with that extension
+        for fileClass in fileClasses:
+            if fileClass.EXTENSION is not None:
+                self._extensionMap.setdefault(fileClass.EXTENSION, fileClass)
+
+        self._suffixClasses = tuple((f'{fileClass.SUFFIX}{fileClass.EXTENSION}', fileClass)
+                                    for fileClass in fileClasses if fileClass.SUFFIX is not None)
+        # (suffix and extension, class) tuples of the classes having a suffix, in fileClasses order
+
+        self._fileEndings = tuple(fileEnding for fileEnding, __ in self._suffixClasses)
+        # File name endings of the classes having a suffix, for a single str.endswith() call
+
+        self._suffixMap = {}
+        # key: str -- file name suffix (None, if the class has no suffix)
+        # value: the first class in fileClasses with that suffix
+        for fileClass in fileClasses:
+            self._suffixMap.setdefault(fileClass.SUFFIX, fileClass)
+
     @abstractmethod
     def make_file_objects(self, sourcePath, **kwargs):
         """Instantiate a source object for conversion from a yWriter project.
@@ -27,9 +27,9 @@ class ImportSourceFactory(FileFactory):
 
         Raise the "Error" exception in case of error. 
         """
-        for fileClass in self._fileClasses:
-            if fileClass.SUFFIX is not None:
-                if sourcePath.endswith(f'{fileClass.SUFFIX }{fileClass.EXTENSION}'):
+        if sourcePath.endswith(self._fileEndings):
+            for fileEnding, fileClass in self._suffixClasses:
+                if sourcePath.endswith(fileEnding):
                     sourceFile = fileClass(sourcePath, **kwargs)
                     return sourceFile, None
 
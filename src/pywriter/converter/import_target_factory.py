@@ -33,21 +33,19 @@ class ImportTargetFactory(FileFactory):
         """
         fileName, __ = os.path.splitext(sourcePath)
         sourceSuffix = kwargs['suffix']
-        if sourceSuffix:
+        if sourceSuffix and sourceSuffix in fileName:
             # Remove the suffix from the source file name.
             # This should also work if the file name already contains the suffix,
             # e.g. "test_notes_notes.odt".
-            e = fileName.split(sourceSuffix)
-            if len(e) > 1:
-                e.pop()
-            ywPathBasis = ''.join(e)
+            ywPathBasis = fileName.rsplit(sourceSuffix, 1)[0].replace(sourceSuffix, '')
         else:
             ywPathBasis = fileName
 
         # Look for an existing yWriter project to rewrite.
         for fileClass in self._fileClasses:
-            if os.path.isfile(f'{ywPathBasis}{fileClass.EXTENSION}'):
-                targetFile = fileClass(f'{ywPathBasis}{fileClass.EXTENSION}', **kwargs)
+            ywPath = ywPathBasis + fileClass.EXTENSION
+            if os.path.isfile(ywPath):
+                targetFile = fileClass(ywPath, **kwargs)
                 return None, targetFile
 
         raise Error(f'{_("No yWriter project to write")}.')
@@ -91,7 +91,7 @@ class YwCnvUi:
             self.ui.set_info_how(f'!{_("File already exists")}: "{norm_path(target.filePath)}".')
         else:
             try:
-                self.check(source, target)
+                self.check(source, target, targetExists=False)
                 source.novel = Novel()
                 source.read()
                 target.novel = source.novel
@@ -158,12 +158,15 @@ class YwCnvUi:
         open_document(self.newFile)
         sys.exit(0)
 
-    def check(self, source, target):
+    def check(self, source, target, targetExists=None):
         """Error handling:
         
         - Check if source and target are correctly initialized.
         - Ask for permission to overwrite target.
         - Raise the "Error" exception in case of error. 
+        
+        Optional arguments:
+            targetExists: bool -- if the caller already knows whether the target file exists.
         """
         if source.filePath is None:
             raise Error(f'{_("File type is not supported")}.')
@@ -174,6 +177,8 @@ class YwCnvUi:
         if target.filePath is None:
             raise Error(f'{_("File type is not supported")}.')
 
-        if os.path.isfile(target.filePath) and not self._confirm_overwrite(target.filePath):
+        if targetExists is None:
+            targetExists = os.path.isfile(target.filePath)
+        if targetExists and not self._confirm_overwrite(target.filePath):
             raise Error(f'{_("Action canceled by user")}.')
 
@@ -5,21 +5,25 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
+import subprocess
+import sys
 from pywriter.pywriter_globals import *
 
+if sys.platform == 'win32':
+    OPEN_COMMAND = None
+    # Use os.startfile().
+elif sys.platform == 'darwin':
+    OPEN_COMMAND = 'open'
+else:
+    OPEN_COMMAND = 'xdg-open'
+
 
 def open_document(document):
     """Open a document with the operating system's standard application."""
     try:
-        os.startfile(norm_path(document))
-        # Windows
+        if OPEN_COMMAND is None:
+            os.startfile(norm_path(document))
+        else:
+            subprocess.Popen([OPEN_COMMAND, norm_path(document)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except:
-        try:
-            os.system('xdg-open "%s"' % norm_path(document))
-            # Linux
-        except:
-            try:
-                os.system('open "%s"' % norm_path(document))
-                # Mac
-            except:
-                pass
+        pass
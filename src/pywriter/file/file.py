@@ -91,18 +91,20 @@ class File(ABC):
         """
         filePath = filePath.replace('\\', '/')
         if self.SUFFIX is not None:
-            suffix = self.SUFFIX
+            fileEnding = f'{self.SUFFIX}{self.EXTENSION}'
         else:
-            suffix = ''
-        if filePath.lower().endswith(f'{suffix}{self.EXTENSION}'.lower()):
-            self._filePath = filePath
-            try:
-                head, tail = os.path.split(os.path.realpath(filePath))
-                # realpath() completes relative paths, but may not work on virtual file systems.
-            except:
-                head, tail = os.path.split(filePath)
-            self.projectPath = quote(head.replace('\\', '/'), '/:')
-            self.projectName = quote(tail.replace(f'{suffix}{self.EXTENSION}', ''))
+            fileEnding = f'{self.EXTENSION}'
+        if not filePath.lower().endswith(fileEnding.lower()):
+            return
+
+        self._filePath = filePath
+        try:
+            head, tail = os.path.split(os.path.realpath(filePath))
+            # realpath() completes relative paths, but may not work on virtual file systems.
+        except:
+            head, tail = os.path.split(filePath)
+        self.projectPath = quote(head.replace('\\', '/'), '/:')
+        self.projectName = quote(tail.replace(fileEnding, ''))
 
     def read(self):
         """Parse the file and get the instance variables.
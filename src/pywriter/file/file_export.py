@@ -8,13 +8,70 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import re
-from string import Template
+from functools import lru_cache
 from pywriter.pywriter_globals import *
+from pywriter.file.format_template import FormatTemplate
 from pywriter.model.character import Character
 from pywriter.model.scene import Scene
 from pywriter.file.file import File
 from pywriter.file.filter import Filter
 
+YW_SPECIAL_CODES = ('HTM', 'TEX', 'RTF', 'epub', 'mobi', 'rtfimg')
+INLINE_CODE = tuple(re.compile(fr'\<{specialCode} .+?\/{specialCode}\>') for specialCode in YW_SPECIAL_CODES)
+# Patterns of inline raw code, in the order of removal
+
+WRITE_BUFFER_SIZE = 1 << 20
+# Buffer size for writing the export fragments, so that their many small writes need few system calls
+
+
+@lru_cache(maxsize=128)
+def get_format_template(template):
+    """Return a FormatTemplate instance for the template string, shared by all exporters."""
+    return FormatTemplate(template)
+
+
+@lru_cache(maxsize=256)
+def get_scene_date(date, day):
+    """Return a tuple with the date, day, and combined date substitutes of a scene."""
+    if date is not None and date != Scene.NULL_DATE:
+        return date, '', date
+
+    if day is not None:
+        return '', day, f'Day {day}'
+
+    return '', '', ''
+
+
+@lru_cache(maxsize=256)
+def get_scene_duration(lastsDays, lastsHours, lastsMinutes):
+    """Return a tuple with the days, hours, minutes, and combined duration substitutes of a scene."""
+    if lastsDays == '0':
+        lastsDays = None
+    if lastsHours == '0':
+        lastsHours = None
+    if lastsMinutes == '0':
+        lastsMinutes = None
+    days = f'{lastsDays}d ' if lastsDays is not None else ''
+    hours = f'{lastsHours}h ' if lastsHours is not None else ''
+    minutes = f'{lastsMinutes}min' if lastsMinutes is not None else ''
+    return lastsDays or '', lastsHours or '', lastsMinutes or '', f'{days}{hours}{minutes}'
+
+
+def sync_directory(filePath):
+    """Commit the directory entry of filePath to the disk, where the platform supports it."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(filePath)), os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows.
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class FileExport(File):
     """Abstract yWriter project file exporter representation.
@@ -76,6 +133,11 @@ class FileExport(File):
         self._locationFilter = Filter()
         self._itemFilter = Filter()
 
+        self._projectSubstitutes = None
+        self._formattedProjectSubstitutes = None
+        self._mappingsPrepared = False
+        # Project-wide substitutes, converted once per export pass; see _get_projectSubstitutes()
+
     def write(self):
         """Write instance variables to the export file.
         
@@ -83,37 +145,81 @@ class FileExport(File):
         Return a message in case of success.
         Raise the "Error" exception in case of error. 
         """
-        text = self._get_text()
-        backedUp = False
+        if type(self)._get_text is FileExport._get_text:
+            fragments = self._get_lines()
+            # The fragments are written one by one, so the text is not held twice in memory.
+        else:
+            fragments = [self._get_text()]
+            # A subclass overriding _get_text() gets its text written as it is.
+
+        # Write a temporary file first, so that a failure leaves the existing file untouched.
+        tempPath = f'{self.filePath}.tmp'
+        try:
+            with open(tempPath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                f.writelines(fragments)
+                f.flush()
+                os.fsync(f.fileno())
+        except (OSError, UnicodeEncodeError) as ex:
+            try:
+                os.remove(tempPath)
+            except OSError:
+                pass
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}" - {str(ex)}')
+
+        backupPath = f'{self.filePath}.bak'
+        movedToBackup = False
         if os.path.isfile(self.filePath):
             try:
-                os.replace(self.filePath, f'{self.filePath}.bak')
-            except:
-                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
-            else:
-                backedUp = True
+                # Link the backup, so that the file stays in place until it is replaced.
+                try:
+                    os.remove(backupPath)
+                except FileNotFoundError:
+                    pass
+                os.link(self.filePath, backupPath)
+            except OSError:
+                # The file system does not support hard links.
+                try:
+                    os.replace(self.filePath, backupPath)
+                    movedToBackup = True
+                except OSError as ex:
+                    try:
+                        os.remove(tempPath)
+                    except OSError:
+                        pass
+                    raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}" - {str(ex)}')
+
         try:
-            with open(self.filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            if backedUp:
-                os.replace(f'{self.filePath}.bak', self.filePath)
-            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+            os.replace(tempPath, self.filePath)
+        except OSError as ex:
+            # E.g. on Windows, if the file is open in another program.
+            try:
+                os.remove(tempPath)
+            except OSError:
+                pass
+            if movedToBackup:
+                try:
+                    os.replace(backupPath, self.filePath)
+                except OSError:
+                    pass
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}" - {str(ex)}')
+
+        sync_directory(self.filePath)
 
     def _get_fileHeaderMapping(self):
         """Return a mapping dictionary for the project section.
         
         This is a template method that can be extended or overridden by subclasses.
         """
+        projectSubstitutes = self._get_projectSubstitutes()
         projectTemplateMapping = dict(
             Title=self._convert_from_yw(self.novel.title, True),
             Desc=self._convert_from_yw(self.novel.desc),
             AuthorName=self._convert_from_yw(self.novel.authorName, True),
             AuthorBio=self._convert_from_yw(self.novel.authorBio, True),
-            FieldTitle1=self._convert_from_yw(self.novel.fieldTitle1, True),
-            FieldTitle2=self._convert_from_yw(self.novel.fieldTitle2, True),
-            FieldTitle3=self._convert_from_yw(self.novel.fieldTitle3, True),
-            FieldTitle4=self._convert_from_yw(self.novel.fieldTitle4, True),
+            FieldTitle1=projectSubstitutes['FieldTitle1'],
+            FieldTitle2=projectSubstitutes['FieldTitle2'],
+            FieldTitle3=projectSubstitutes['FieldTitle3'],
+            FieldTitle4=projectSubstitutes['FieldTitle4'],
             Language=self.novel.languageCode,
             Country=self.novel.countryCode,
         )
@@ -130,9 +236,7 @@ class FileExport(File):
         
         Overrides the superclass method.
         """
-        if text is None:
-            text = ''
-        return(text)
+        return text or ''
 
     def _get_chapterMapping(self, chId, chapterNumber):
         """Return a mapping dictionary for a chapter section.
@@ -143,15 +247,17 @@ class FileExport(File):
         
         This is a template method that can be extended or overridden by subclasses.
         """
+        projectSubstitutes = self._get_projectSubstitutes()
         if chapterNumber == 0:
             chapterNumber = ''
 
+        chapter = self.novel.chapters[chId]
         chapterMapping = dict(
             ID=chId,
             ChapterNumber=chapterNumber,
-            Title=self._convert_from_yw(self.novel.chapters[chId].title, True),
-            Desc=self._convert_from_yw(self.novel.chapters[chId].desc),
-            ProjectName=self._convert_from_yw(self.projectName, True),
+            Title=self._convert_from_yw(chapter.title, True),
+            Desc=self._convert_from_yw(chapter.desc),
+            ProjectName=projectSubstitutes['ProjectName'],
             ProjectPath=self.projectPath,
             Language=self.novel.languageCode,
             Country=self.novel.countryCode,
@@ -173,6 +279,19 @@ class FileExport(File):
         sceneNumber = 0
         wordsTotal = 0
         lettersTotal = 0
+        chapterTypeTemplates = {
+            1: (self._notesPartTemplate, self._notesChapterTemplate),
+            2: (self._todoPartTemplate, self._todoChapterTemplate),
+            3: (self._unusedChapterTemplate, self._unusedChapterTemplate),
+        }
+        # key: chapter type ("Notes", "Todo", "Unused"), value: (part template, chapter template)
+        chapterTypeEndTemplates = {
+            1: self._notesChapterEndTemplate,
+            2: self._todoChapterEndTemplate,
+            3: self._unusedChapterEndTemplate,
+        }
+        # key: chapter type ("Notes", "Todo", "Unused"), value: chapter end template
+        scenes = self.novel.scenes
         for chId in self.novel.srtChapters:
             dispNumber = 0
             if not self._chapterFilter.accept(self, chId):
@@ -181,46 +300,27 @@ class FileExport(File):
             # The order counts; be aware that "Todo" and "Notes" chapters are
             # always unused.
             # Has the chapter only scenes not to be exported?
-            sceneCount = 0
-            notExportCount = 0
-            doNotExport = False
+            # The check stops at the first scene to be exported.
+            chapter = self.novel.chapters[chId]
+            doNotExport = bool(chapter.srtScenes) and all(scenes[scId].doNotExport for scId in chapter.srtScenes)
             template = None
-            for scId in self.novel.chapters[chId].srtScenes:
-                sceneCount += 1
-                if self.novel.scenes[scId].doNotExport:
-                    notExportCount += 1
-            if sceneCount > 0 and notExportCount == sceneCount:
-                doNotExport = True
-            if self.novel.chapters[chId].chType == 2:
-                # Chapter is "Todo" type.
-                if self.novel.chapters[chId].chLevel == 1:
-                    # Chapter is "Todo Part" type.
-                    if self._todoPartTemplate:
-                        template = Template(self._todoPartTemplate)
-                elif self._todoChapterTemplate:
-                    template = Template(self._todoChapterTemplate)
-            elif self.novel.chapters[chId].chType == 1:
-                # Chapter is "Notes" type.
-                if self.novel.chapters[chId].chLevel == 1:
-                    # Chapter is "Notes Part" type.
-                    if self._notesPartTemplate:
-                        template = Template(self._notesPartTemplate)
-                elif self._notesChapterTemplate:
-                    template = Template(self._notesChapterTemplate)
-            elif self.novel.chapters[chId].chType == 3:
-                # Chapter is "unused" type.
-                if self._unusedChapterTemplate:
-                    template = Template(self._unusedChapterTemplate)
+            if chapter.chType in chapterTypeTemplates:
+                partTemplate, chapterTemplate = chapterTypeTemplates[chapter.chType]
+                if chapter.chLevel == 1:
+                    if partTemplate:
+                        template = self._get_template(partTemplate)
+                elif chapterTemplate:
+                    template = self._get_template(chapterTemplate)
             elif doNotExport:
                 if self._notExportedChapterTemplate:
-                    template = Template(self._notExportedChapterTemplate)
-            elif self.novel.chapters[chId].chLevel == 1 and self._partTemplate:
-                template = Template(self._partTemplate)
+                    template = self._get_template(self._notExportedChapterTemplate)
+            elif chapter.chLevel == 1 and self._partTemplate:
+                template = self._get_template(self._partTemplate)
             else:
-                template = Template(self._chapterTemplate)
+                template = self._get_template(self._chapterTemplate)
                 chapterNumber += 1
                 dispNumber = chapterNumber
-            if template is not None:
+            if template is not None and template.template:
                 lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
 
             #--- Process scenes.
@@ -229,22 +329,16 @@ class FileExport(File):
             lines.extend(sceneLines)
 
             #--- Process chapter ending.
-            template = None
-            if self.novel.chapters[chId].chType == 2:
-                if self._todoChapterEndTemplate:
-                    template = Template(self._todoChapterEndTemplate)
-            elif self.novel.chapters[chId].chType == 1:
-                if self._notesChapterEndTemplate:
-                    template = Template(self._notesChapterEndTemplate)
-            elif self.novel.chapters[chId].chType == 3:
-                if self._unusedChapterEndTemplate:
-                    template = Template(self._unusedChapterEndTemplate)
+            if chapter.chType in chapterTypeEndTemplates:
+                chapterEndTemplate = chapterTypeEndTemplates[chapter.chType]
             elif doNotExport:
-                if self._notExportedChapterEndTemplate:
-                    template = Template(self._notExportedChapterEndTemplate)
-            elif self._chapterEndTemplate:
-                template = Template(self._chapterEndTemplate)
-            if template is not None:
+                chapterEndTemplate = self._notExportedChapterEndTemplate
+            else:
+                chapterEndTemplate = self._chapterEndTemplate
+            template = None
+            if chapterEndTemplate:
+                template = self._get_template(chapterEndTemplate)
+            if template is not None and template.template:
                 lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
         return lines
 
@@ -256,28 +350,30 @@ class FileExport(File):
         
         This is a template method that can be extended or overridden by subclasses.
         """
-        if self.novel.characters[crId].tags is not None:
-            tags = list_to_string(self.novel.characters[crId].tags, divider=self._DIVIDER)
+        projectSubstitutes = self._get_projectSubstitutes(False)
+        character = self.novel.characters[crId]
+        if character.tags:
+            tags = list_to_string(character.tags, divider=self._DIVIDER)
         else:
             tags = ''
-        if self.novel.characters[crId].isMajor:
+        if character.isMajor:
             characterStatus = Character.MAJOR_MARKER
         else:
             characterStatus = Character.MINOR_MARKER
 
         characterMapping = dict(
             ID=crId,
-            Title=self._convert_from_yw(self.novel.characters[crId].title, True),
-            Desc=self._convert_from_yw(self.novel.characters[crId].desc),
+            Title=self._convert_from_yw(character.title, True),
+            Desc=self._convert_from_yw(character.desc),
             Tags=self._convert_from_yw(tags),
-            Image=self.novel.characters[crId].image,
-            AKA=self._convert_from_yw(self.novel.characters[crId].aka, True),
-            Notes=self._convert_from_yw(self.novel.characters[crId].notes),
-            Bio=self._convert_from_yw(self.novel.characters[crId].bio),
-            Goals=self._convert_from_yw(self.novel.characters[crId].goals),
-            FullName=self._convert_from_yw(self.novel.characters[crId].fullName, True),
+            Image=character.image,
+            AKA=self._convert_from_yw(character.aka, True),
+            Notes=self._convert_from_yw(character.notes),
+            Bio=self._convert_from_yw(character.bio),
+            Goals=self._convert_from_yw(character.goals),
+            FullName=self._convert_from_yw(character.fullName, True),
             Status=characterStatus,
-            ProjectName=self._convert_from_yw(self.projectName),
+            ProjectName=projectSubstitutes['ProjectName'],
             ProjectPath=self.projectPath,
         )
         return characterMapping
@@ -295,7 +391,11 @@ class FileExport(File):
             lines = [self._characterSectionHeading]
         else:
             lines = []
-        template = Template(self._characterTemplate)
+        if not self._characterTemplate:
+            # Nothing to substitute.
+            return lines
+
+        template = self._get_template(self._characterTemplate)
         for crId in self.novel.srtCharacters:
             if self._characterFilter.accept(self, crId):
                 lines.append(template.safe_substitute(self._get_characterMapping(crId)))
@@ -311,7 +411,7 @@ class FileExport(File):
         This is a template method that can be extended or overridden by subclasses.
         """
         lines = []
-        template = Template(self._fileHeader)
+        template = self._get_template(self._fileHeader)
         lines.append(template.safe_substitute(self._get_fileHeaderMapping()))
         return lines
 
@@ -323,19 +423,21 @@ class FileExport(File):
         
         This is a template method that can be extended or overridden by subclasses.
         """
-        if self.novel.items[itId].tags is not None:
-            tags = list_to_string(self.novel.items[itId].tags, divider=self._DIVIDER)
+        projectSubstitutes = self._get_projectSubstitutes()
+        item = self.novel.items[itId]
+        if item.tags:
+            tags = list_to_string(item.tags, divider=self._DIVIDER)
         else:
             tags = ''
 
         itemMapping = dict(
             ID=itId,
-            Title=self._convert_from_yw(self.novel.items[itId].title, True),
-            Desc=self._convert_from_yw(self.novel.items[itId].desc),
+            Title=self._convert_from_yw(item.title, True),
+            Desc=self._convert_from_yw(item.desc),
             Tags=self._convert_from_yw(tags, True),
-            Image=self.novel.items[itId].image,
-            AKA=self._convert_from_yw(self.novel.items[itId].aka, True),
-            ProjectName=self._convert_from_yw(self.projectName, True),
+            Image=item.image,
+            AKA=self._convert_from_yw(item.aka, True),
+            ProjectName=projectSubstitutes['ProjectName'],
             ProjectPath=self.projectPath,
         )
         return itemMapping
@@ -353,7 +455,11 @@ class FileExport(File):
             lines = [self._itemSectionHeading]
         else:
             lines = []
-        template = Template(self._itemTemplate)
+        if not self._itemTemplate:
+            # Nothing to substitute.
+            return lines
+
+        template = self._get_template(self._itemTemplate)
         for itId in self.novel.srtItems:
             if self._itemFilter.accept(self, itId):
                 lines.append(template.safe_substitute(self._get_itemMapping(itId)))
@@ -367,19 +473,21 @@ class FileExport(File):
         
         This is a template method that can be extended or overridden by subclasses.
         """
-        if self.novel.locations[lcId].tags is not None:
-            tags = list_to_string(self.novel.locations[lcId].tags, divider=self._DIVIDER)
+        projectSubstitutes = self._get_projectSubstitutes()
+        location = self.novel.locations[lcId]
+        if location.tags:
+            tags = list_to_string(location.tags, divider=self._DIVIDER)
         else:
             tags = ''
 
         locationMapping = dict(
             ID=lcId,
-            Title=self._convert_from_yw(self.novel.locations[lcId].title, True),
-            Desc=self._convert_from_yw(self.novel.locations[lcId].desc),
+            Title=self._convert_from_yw(location.title, True),
+            Desc=self._convert_from_yw(location.desc),
             Tags=self._convert_from_yw(tags, True),
-            Image=self.novel.locations[lcId].image,
-            AKA=self._convert_from_yw(self.novel.locations[lcId].aka, True),
-            ProjectName=self._convert_from_yw(self.projectName, True),
+            Image=location.image,
+            AKA=self._convert_from_yw(location.aka, True),
+            ProjectName=projectSubstitutes['ProjectName'],
             ProjectPath=self.projectPath,
         )
         return locationMapping
@@ -397,7 +505,11 @@ class FileExport(File):
             lines = [self._locationSectionHeading]
         else:
             lines = []
-        template = Template(self._locationTemplate)
+        if not self._locationTemplate:
+            # Nothing to substitute.
+            return lines
+
+        template = self._get_template(self._locationTemplate)
         for lcId in self.novel.srtLocations:
             if self._locationFilter.accept(self, lcId):
                 lines.append(template.safe_substitute(self._get_locationMapping(lcId)))
@@ -414,113 +526,83 @@ class FileExport(File):
         
         This is a template method that can be extended or overridden by subclasses.
         """
+        projectSubstitutes = self._get_projectSubstitutes()
+        scene = self.novel.scenes[scId]
 
         #--- Create a comma separated tag list.
         if sceneNumber == 0:
             sceneNumber = ''
-        if self.novel.scenes[scId].tags is not None:
-            tags = list_to_string(self.novel.scenes[scId].tags, divider=self._DIVIDER)
+        if scene.tags:
+            tags = list_to_string(scene.tags, divider=self._DIVIDER)
         else:
             tags = ''
 
         #--- Create a comma separated character list.
-        try:
-            # Note: Due to a bug, yWriter scenes might hold invalid
-            # viepoint characters
-            sChList = []
-            for crId in self.novel.scenes[scId].characters:
-                sChList.append(self.novel.characters[crId].title)
+        # Note: Due to a bug, yWriter scenes might hold invalid
+        # viepoint characters
+        characters = self.novel.characters
+        if scene.characters and all(crId in characters for crId in scene.characters):
+            sChList = [characters[crId].title for crId in scene.characters]
             sceneChars = list_to_string(sChList, divider=self._DIVIDER)
             viewpointChar = sChList[0]
-        except:
+        else:
             sceneChars = ''
             viewpointChar = ''
 
         #--- Create a comma separated location list.
-        if self.novel.scenes[scId].locations is not None:
-            sLcList = []
-            for lcId in self.novel.scenes[scId].locations:
-                sLcList.append(self.novel.locations[lcId].title)
+        if scene.locations is not None:
+            locations = self.novel.locations
+            sLcList = [locations[lcId].title for lcId in scene.locations]
             sceneLocs = list_to_string(sLcList, divider=self._DIVIDER)
         else:
             sceneLocs = ''
 
         #--- Create a comma separated item list.
-        if self.novel.scenes[scId].items is not None:
-            sItList = []
-            for itId in self.novel.scenes[scId].items:
-                sItList.append(self.novel.items[itId].title)
+        if scene.items is not None:
+            items = self.novel.items
+            sItList = [items[itId].title for itId in scene.items]
             sceneItems = list_to_string(sItList, divider=self._DIVIDER)
         else:
             sceneItems = ''
 
         #--- Create A/R marker string.
-        if self.novel.scenes[scId].isReactionScene:
+        if scene.isReactionScene:
             reactionScene = Scene.REACTION_MARKER
         else:
             reactionScene = Scene.ACTION_MARKER
 
         #--- Date or day.
-        if self.novel.scenes[scId].date is not None and self.novel.scenes[scId].date != Scene.NULL_DATE:
-            scDay = ''
-            scDate = self.novel.scenes[scId].date
-            cmbDate = self.novel.scenes[scId].date
-        else:
-            scDate = ''
-            if self.novel.scenes[scId].day is not None:
-                scDay = self.novel.scenes[scId].day
-                cmbDate = f'Day {self.novel.scenes[scId].day}'
-            else:
-                scDay = ''
-                cmbDate = ''
+        scDate, scDay, cmbDate = get_scene_date(scene.date, scene.day)
 
         #--- Time.
-        if self.novel.scenes[scId].time is not None:
-            scTime = self.novel.scenes[scId].time.rsplit(':', 1)[0]
+        if scene.time is not None:
+            scTime = scene.time.rsplit(':', 1)[0]
             # remove seconds
         else:
             scTime = ''
 
         #--- Create a combined duration information.
-        if self.novel.scenes[scId].lastsDays is not None and self.novel.scenes[scId].lastsDays != '0':
-            lastsDays = self.novel.scenes[scId].lastsDays
-            days = f'{self.novel.scenes[scId].lastsDays}d '
-        else:
-            lastsDays = ''
-            days = ''
-        if self.novel.scenes[scId].lastsHours is not None and self.novel.scenes[scId].lastsHours != '0':
-            lastsHours = self.novel.scenes[scId].lastsHours
-            hours = f'{self.novel.scenes[scId].lastsHours}h '
-        else:
-            lastsHours = ''
-            hours = ''
-        if self.novel.scenes[scId].lastsMinutes is not None and self.novel.scenes[scId].lastsMinutes != '0':
-            lastsMinutes = self.novel.scenes[scId].lastsMinutes
-            minutes = f'{self.novel.scenes[scId].lastsMinutes}min'
-        else:
-            lastsMinutes = ''
-            minutes = ''
-        duration = f'{days}{hours}{minutes}'
+        lastsDays, lastsHours, lastsMinutes, duration = get_scene_duration(
+            scene.lastsDays, scene.lastsHours, scene.lastsMinutes)
 
+        convert = self._convert_from_yw
+        # Bind the method once for the scene's many conversions.
         sceneMapping = dict(
+            projectSubstitutes,
             ID=scId,
             SceneNumber=sceneNumber,
-            Title=self._convert_from_yw(self.novel.scenes[scId].title, True),
-            Desc=self._convert_from_yw(self.novel.scenes[scId].desc),
-            WordCount=str(self.novel.scenes[scId].wordCount),
+            Title=convert(scene.title, True),
+            Desc=convert(scene.desc),
+            WordCount=str(scene.wordCount),
             WordsTotal=wordsTotal,
-            LetterCount=str(self.novel.scenes[scId].letterCount),
+            LetterCount=str(scene.letterCount),
             LettersTotal=lettersTotal,
-            Status=Scene.STATUS[self.novel.scenes[scId].status],
-            SceneContent=self._convert_from_yw(self.novel.scenes[scId].sceneContent),
-            FieldTitle1=self._convert_from_yw(self.novel.fieldTitle1, True),
-            FieldTitle2=self._convert_from_yw(self.novel.fieldTitle2, True),
-            FieldTitle3=self._convert_from_yw(self.novel.fieldTitle3, True),
-            FieldTitle4=self._convert_from_yw(self.novel.fieldTitle4, True),
-            Field1=self.novel.scenes[scId].field1,
-            Field2=self.novel.scenes[scId].field2,
-            Field3=self.novel.scenes[scId].field3,
-            Field4=self.novel.scenes[scId].field4,
+            Status=Scene.STATUS[scene.status],
+            SceneContent=convert(scene.sceneContent),
+            Field1=scene.field1,
+            Field2=scene.field2,
+            Field3=scene.field3,
+            Field4=scene.field4,
             Date=scDate,
             Time=scTime,
             Day=scDay,
@@ -530,20 +612,16 @@ class FileExport(File):
             LastsMinutes=lastsMinutes,
             Duration=duration,
             ReactionScene=reactionScene,
-            Goal=self._convert_from_yw(self.novel.scenes[scId].goal),
-            Conflict=self._convert_from_yw(self.novel.scenes[scId].conflict),
-            Outcome=self._convert_from_yw(self.novel.scenes[scId].outcome),
-            Tags=self._convert_from_yw(tags, True),
-            Image=self.novel.scenes[scId].image,
+            Goal=convert(scene.goal),
+            Conflict=convert(scene.conflict),
+            Outcome=convert(scene.outcome),
+            Tags=convert(tags, True),
+            Image=scene.image,
             Characters=sceneChars,
             Viewpoint=viewpointChar,
             Locations=sceneLocs,
             Items=sceneItems,
-            Notes=self._convert_from_yw(self.novel.scenes[scId].notes),
-            ProjectName=self._convert_from_yw(self.projectName, True),
-            ProjectPath=self.projectPath,
-            Language=self.novel.languageCode,
-            Country=self.novel.countryCode,
+            Notes=convert(scene.notes),
         )
         return sceneMapping
 
@@ -571,62 +649,61 @@ class FileExport(File):
         """
         lines = []
         firstSceneInChapter = True
-        for scId in self.novel.chapters[chId].srtScenes:
+        sceneTypeTemplates = {
+            1: self._notesSceneTemplate,
+            2: self._todoSceneTemplate,
+            3: self._unusedSceneTemplate,
+        }
+        # key: scene type ("Notes", "Todo", "Unused"), value: template
+        chapter = self.novel.chapters[chId]
+        chapterIsUnused = chapter.chType == 3
+        scenes = self.novel.scenes
+        for scId in chapter.srtScenes:
             dispNumber = 0
             if not self._sceneFilter.accept(self, scId):
                 continue
 
-            sceneContent = self.novel.scenes[scId].sceneContent
+            scene = scenes[scId]
+            sceneContent = scene.sceneContent
             if sceneContent is None:
                 sceneContent = ''
 
             # The order counts; be aware that "Todo" and "Notes" scenes are
             # always unused.
-            if self.novel.scenes[scId].scType == 2:
-                if self._todoSceneTemplate:
-                    template = Template(self._todoSceneTemplate)
-                else:
-                    continue
-
-            elif self.novel.scenes[scId].scType == 1:
-                # Scene is "Notes" type.
-                if self._notesSceneTemplate:
-                    template = Template(self._notesSceneTemplate)
-                else:
-                    continue
-
-            elif self.novel.scenes[scId].scType == 3 or self.novel.chapters[chId].chType == 3:
-                if self._unusedSceneTemplate:
-                    template = Template(self._unusedSceneTemplate)
-                else:
-                    continue
-
-            elif self.novel.scenes[scId].doNotExport or doNotExport:
-                if self._notExportedSceneTemplate:
-                    template = Template(self._notExportedSceneTemplate)
-                else:
-                    continue
-
-            elif sceneContent.startswith('<HTML>'):
+            isRegularScene = False
+            if scene.scType in sceneTypeTemplates:
+                specialTemplate = sceneTypeTemplates[scene.scType]
+            elif chapterIsUnused:
+                specialTemplate = self._unusedSceneTemplate
+            elif scene.doNotExport or doNotExport:
+                specialTemplate = self._notExportedSceneTemplate
+            elif sceneContent.startswith(('<HTML>', '<TEX>')):
+                # Raw HTML or LaTeX scene.
                 continue
 
-            elif sceneContent.startswith('<TEX>'):
-                continue
+            else:
+                isRegularScene = True
+            if not isRegularScene:
+                if not specialTemplate:
+                    continue
 
+                template = self._get_template(specialTemplate)
             else:
                 sceneNumber += 1
                 dispNumber = sceneNumber
-                wordsTotal += self.novel.scenes[scId].wordCount
-                lettersTotal += self.novel.scenes[scId].letterCount
-                template = Template(self._sceneTemplate)
-                if not firstSceneInChapter and self.novel.scenes[scId].appendToPrev and self._appendedSceneTemplate:
-                    template = Template(self._appendedSceneTemplate)
-            if not (firstSceneInChapter or self.novel.scenes[scId].appendToPrev):
+                wordsTotal += scene.wordCount
+                lettersTotal += scene.letterCount
+                template = self._get_template(self._sceneTemplate)
+                if not firstSceneInChapter and scene.appendToPrev and self._appendedSceneTemplate:
+                    template = self._get_template(self._appendedSceneTemplate)
+            if not (firstSceneInChapter or scene.appendToPrev):
                 lines.append(self._sceneDivider)
             if firstSceneInChapter and self._firstSceneTemplate:
-                template = Template(self._firstSceneTemplate)
-            lines.append(template.safe_substitute(self._get_sceneMapping(
-                        scId, dispNumber, wordsTotal, lettersTotal)))
+                template = self._get_template(self._firstSceneTemplate)
+            if template.template:
+                # An empty template needs no mapping.
+                lines.append(template.safe_substitute(self._get_sceneMapping(
+                            scId, dispNumber, wordsTotal, lettersTotal)))
             firstSceneInChapter = False
         return lines, sceneNumber, wordsTotal, lettersTotal
 
@@ -638,11 +715,13 @@ class FileExport(File):
         
         This is a template method that can be extended or overridden by subclasses.
         """
+        projectSubstitutes = self._get_projectSubstitutes()
+        projectNote = self.novel.projectNotes[pnId]
         itemMapping = dict(
             ID=pnId,
-            Title=self._convert_from_yw(self.novel.projectNotes[pnId].title, True),
-            Desc=self._convert_from_yw(self.novel.projectNotes[pnId].desc, True),
-            ProjectName=self._convert_from_yw(self.projectName, True),
+            Title=self._convert_from_yw(projectNote.title, True),
+            Desc=self._convert_from_yw(projectNote.desc, True),
+            ProjectName=projectSubstitutes['ProjectName'],
             ProjectPath=self.projectPath,
         )
         return itemMapping
@@ -657,18 +736,52 @@ class FileExport(File):
         This is a template method that can be extended or overridden by subclasses.
         """
         lines = []
-        template = Template(self._projectNoteTemplate)
+        if not self._projectNoteTemplate:
+            # Nothing to substitute.
+            return lines
+
+        template = self._get_template(self._projectNoteTemplate)
         for pnId in self.novel.srtPrjNotes:
             map = self._get_prjNoteMapping(pnId)
             lines.append(template.safe_substitute(map))
         return lines
 
-    def _get_text(self):
+    def _get_projectSubstitutes(self, quick=True):
+        """Return a dictionary with the project-wide substitutes.
+        
+        Optional arguments:
+            quick: bool -- if False, the project name is converted like a multi-line text.
+        
+        The substitutes are converted on first use in each export pass.
+        Outside an export pass, they are converted on first use after 
+        _mappingsPrepared is reset, e.g. after changing the novel.
+        """
+        if not self._mappingsPrepared:
+            self._prepare_mappings()
+            self._mappingsPrepared = True
+        if quick:
+            return self._projectSubstitutes
+
+        return self._formattedProjectSubstitutes
+
+    def _get_template(self, template):
+        """Return a FormatTemplate instance for the template string.
+        
+        Positional arguments:
+            template: str -- template with placeholders.
+        
+        Each template string is compiled only once per process.
+        """
+        return get_format_template(template)
+
+    def _get_lines(self):
         """Call all processing methods.
         
-        Return a string to be written to the output file.
+        Return a list of strings to be written to the output file.
         This is a template method that can be extended or overridden by subclasses.
         """
+        self._mappingsPrepared = False
+        # Have the project-wide substitutes converted anew on first use.
         lines = self._get_fileHeader()
         lines.extend(self._get_chapters())
         lines.extend(self._get_characters())
@@ -676,15 +789,48 @@ class FileExport(File):
         lines.extend(self._get_items())
         lines.extend(self._get_projectNotes())
         lines.append(self._fileFooter)
-        return ''.join(lines)
+        self._mappingsPrepared = False
+        # Mapping methods called after the export do not get its substitutes.
+        return lines
+
+    def _get_text(self):
+        """Return a string to be written to the output file.
+        
+        This is a template method that can be extended or overridden by subclasses.
+        """
+        return ''.join(self._get_lines())
+
+    def _prepare_mappings(self):
+        """Convert the project-wide substitutes that all sections share.
+        
+        _get_projectSubstitutes() calls this on first use after each export pass began.
+        This is a template method that can be extended by subclasses.
+        """
+        self._projectSubstitutes = dict(
+            FieldTitle1=self._convert_from_yw(self.novel.fieldTitle1, True),
+            FieldTitle2=self._convert_from_yw(self.novel.fieldTitle2, True),
+            FieldTitle3=self._convert_from_yw(self.novel.fieldTitle3, True),
+            FieldTitle4=self._convert_from_yw(self.novel.fieldTitle4, True),
+            ProjectName=self._convert_from_yw(self.projectName, True),
+            ProjectPath=self.projectPath,
+            Language=self.novel.languageCode,
+            Country=self.novel.countryCode,
+        )
+        # The scene mappings start with a copy of these entries.
+        self._formattedProjectSubstitutes = dict(
+            self._projectSubstitutes,
+            ProjectName=self._convert_from_yw(self.projectName),
+        )
+        # The character sections convert the project name like a multi-line text.
 
     def _remove_inline_code(self, text):
         """Remove inline raw code from text and return the result."""
         if text:
-            text = text.replace('<RTFBRK>', '')
-            YW_SPECIAL_CODES = ('HTM', 'TEX', 'RTF', 'epub', 'mobi', 'rtfimg')
-            for specialCode in YW_SPECIAL_CODES:
-                text = re.sub(fr'\<{specialCode} .+?\/{specialCode}\>', '', text)
+            if '<' in text:
+                # All inline codes begin with "<", so most texts need no scanning.
+                text = text.replace('<RTFBRK>', '')
+                for inlineCode in INLINE_CODE:
+                    text = inlineCode.sub('', text)
         else:
             text = ''
         return text
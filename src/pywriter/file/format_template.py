@@ -0,0 +1,86 @@
+"""Provide a class for templates substituted by str.format_map.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from string import Template
+
+
+class FormatTemplate:
+    """Template with string.Template placeholders, translated once into a format string.
+    
+    Public methods:
+        safe_substitute(mapping) -- return the template with the placeholders substituted.
+
+    Public instance variables:
+        template: str -- the template string passed to the constructor.
+
+    Placeholders, escapes, and missing keys are handled like 
+    string.Template.safe_substitute() does, but the substitution 
+    is done by str.format_map() instead of a regular expression. 
+    """
+
+    def __init__(self, template):
+        """Translate the template into a format string.
+        
+        Positional arguments:
+            template: str -- template with $placeholders.
+        """
+        self.template = template
+        parts = []
+        completeParts = []
+        self._names = set()
+        position = 0
+        for match in Template.pattern.finditer(template):
+            text = template[position:match.start()].replace('{', '{{').replace('}', '}}')
+            parts.append(text)
+            completeParts.append(text)
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                # Escaped or invalid delimiter.
+                parts.append('$')
+                completeParts.append('$')
+            else:
+                self._names.add(name)
+                completeParts.append(f'{{{name}}}')
+                if match.group('named') is not None:
+                    parts.append(f'{{{name}}}')
+                else:
+                    parts.append(f'{{${name}}}')
+                    # The "$" prefix tells the braced form apart, if the key is missing.
+            position = match.end()
+        text = template[position:].replace('{', '{{').replace('}', '}}')
+        parts.append(text)
+        completeParts.append(text)
+        self._format = ''.join(parts)
+        self._completeFormat = ''.join(completeParts)
+        # Format string for mappings providing all placeholder names
+
+    def safe_substitute(self, mapping):
+        """Return the template with the placeholders substituted from mapping.
+        
+        Positional arguments:
+            mapping: dict -- placeholder names and substitutes.
+
+        Placeholders without substitute are left unchanged.
+        """
+        if mapping.keys() >= self._names:
+            # No placeholder is missing, so the mapping needs not be copied.
+            return self._completeFormat.format_map(mapping)
+
+        return self._format.format_map(SafeMapping(mapping))
+
+
+class SafeMapping(dict):
+    """Dictionary returning the placeholder itself for missing keys."""
+
+    def __missing__(self, key):
+        if key.startswith('$'):
+            name = key[1:]
+            if name in self:
+                return self[name]
+
+            return f'${{{name}}}'
+
+        return f'${key}'
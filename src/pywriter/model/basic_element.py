@@ -14,6 +14,8 @@ class BasicElement:
         desc: str -- description.
         kwVar: dict -- custom keyword variables.
     """
+    __slots__ = ('title', 'desc', 'kwVar')
+    # A project has many elements, so their attributes are not held in a per-instance dictionary.
 
     def __init__(self):
         """Initialize instance variables."""
@@ -12,8 +12,10 @@ def create_id(elements):
     Positional arguments:
         elements -- list or dictionary containing all existing IDs
     """
+    usedIds = set(elements)
+    # Membership tests on a list would take linear time for each candidate.
     i = 1
-    while str(i) in elements:
+    while str(i) in usedIds:
         i += 1
     return str(i)
 
@@ -6,12 +6,27 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import locale
 import re
+from functools import lru_cache
 from pywriter.pywriter_globals import *
 from pywriter.model.basic_element import BasicElement
 
 LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
 
 
+@lru_cache(maxsize=1)
+def get_system_locale():
+    """Return a tuple with the system's language code and country code.
+    
+    The locale is looked up only once per process.
+    """
+    try:
+        sysLng, sysCtr = locale.getlocale()[0].split('_')
+    except:
+        # Fallback for old Windows versions.
+        sysLng, sysCtr = locale.getdefaultlocale()[0].split('_')
+    return sysLng, sysCtr
+
+
 class Novel(BasicElement):
     """Novel representation.
 
@@ -143,27 +158,15 @@ class Novel(BasicElement):
         - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
         - language code: 'en-AU'
         """
-
-        def languages(text):
-            """Return the language codes appearing in text.
-            
-            Example:
-            - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
-            - language code: 'en-AU'
-            """
-            if text:
-                m = LANGUAGE_TAG.search(text)
-                while m:
-                    text = text[m.span()[1]:]
-                    yield m.group(1)
-                    m = LANGUAGE_TAG.search(text)
-
         self.languages = []
-        for scId in self.scenes:
-            text = self.scenes[scId].sceneContent
+        foundLanguages = set()
+        # The list keeps the order of appearance, the set speeds up the membership test.
+        for scene in self.scenes.values():
+            text = scene.sceneContent
             if text:
-                for language in languages(text):
-                    if not language in self.languages:
+                for language in LANGUAGE_TAG.findall(text):
+                    if not language in foundLanguages:
+                        foundLanguages.add(language)
                         self.languages.append(language)
 
     def check_locale(self):
@@ -174,13 +177,7 @@ class Novel(BasicElement):
         """
         if not self.languageCode:
             # Language isn't set.
-            try:
-                sysLng, sysCtr = locale.getlocale()[0].split('_')
-            except:
-                # Fallback for old Windows versions.
-                sysLng, sysCtr = locale.getdefaultlocale()[0].split('_')
-            self.languageCode = sysLng
-            self.countryCode = sysCtr
+            self.languageCode, self.countryCode = get_system_locale()
             return
 
         try:
@@ -76,6 +76,11 @@ class Scene(BasicElement):
     NULL_DATE = '0001-01-01'
     NULL_TIME = '00:00:00'
 
+    __slots__ = ('_sceneContent', 'wordCount', 'letterCount', 'scType', 'doNotExport', 'status', 'notes', 'tags',
+                 'field1', 'field2', 'field3', 'field4', 'appendToPrev', 'isReactionScene', 'isSubPlot',
+                 'goal', 'conflict', 'outcome', 'characters', 'locations', 'items',
+                 'date', 'time', 'day', 'lastsMinutes', 'lastsHours', 'lastsDays', 'image', 'scnArcs', 'scnMode')
+
     def __init__(self):
         """Initialize instance variables.
         
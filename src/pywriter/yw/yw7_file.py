@@ -1505,18 +1505,12 @@ class Yw7File(File):
                         day = ''
                     self.novel.scenes[scId].day = day
 
-                hasUnspecificTime = False
-                if xmlScene.find('Hour') is not None:
-                    hour = xmlScene.find('Hour').text.zfill(2)
-                    hasUnspecificTime = True
-                else:
-                    hour = '00'
-                if xmlScene.find('Minute') is not None:
-                    minute = xmlScene.find('Minute').text.zfill(2)
-                    hasUnspecificTime = True
-                else:
-                    minute = '00'
-                if hasUnspecificTime:
+                xmlHour = xmlScene.find('Hour')
+                xmlMinute = xmlScene.find('Minute')
+                if xmlHour is not None or xmlMinute is not None:
+                    # Unspecific time.
+                    hour = xmlHour.text.zfill(2) if xmlHour is not None else '00'
+                    minute = xmlMinute.text.zfill(2) if xmlMinute is not None else '00'
                     self.novel.scenes[scId].time = f'{hour}:{minute}:00'
 
             #--- Scene duration.
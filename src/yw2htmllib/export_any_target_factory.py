@@ -30,12 +30,14 @@ class ExportAnyTargetFactory(FileFactory):
 
         Raise the "Error" exception in case of error.          
         """
+        if not self._fileClasses:
+            raise Error(f'File type of "{norm_path(sourcePath)}" not supported.')
+
+        # Any suffix is accepted, so the first file class is always taken.
+        fileClass = self._fileClasses[0]
         fileName, __ = os.path.splitext(sourcePath)
         suffix = kwargs['suffix']
-        for fileClass in self._fileClasses:
-            if suffix is None:
-                suffix = ''
-            targetFile = fileClass(f'{fileName}{suffix}{fileClass.EXTENSION}', **kwargs)
-            return None, targetFile
-
-        raise Error(f'File type of "{norm_path(sourcePath)}" not supported.')
+        if suffix is None:
+            suffix = ''
+        targetFile = fileClass(f'{fileName}{suffix}{fileClass.EXTENSION}', **kwargs)
+        return None, targetFile
@@ -7,6 +7,23 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 import re
 from pywriter.file.file_export import FileExport
 
+HTML_REPLACEMENTS = {
+    '[i]': '<em>',
+    '[/i]': '</em>',
+    '[b]': '<strong>',
+    '[/b]': '</strong>',
+    '<p></p>': '<p><br /></p>',
+    '/*': '<!--',
+    '*/': '-->',
+}
+# yw7 markup to be replaced after converting the line breaks
+
+YW_MARKUP = re.compile(
+    '|'.join(re.escape(yw) for yw in HTML_REPLACEMENTS if yw != '*/') + r'|\*/(?!\*)|\[\/*[hcrsu]\d*\]')
+# Replaceable markup, and highlighting, alignment,
+# strikethrough, and underline tags to be removed.
+# "*/" is not matched if followed by "*", because "/*" has priority where they overlap.
+
 
 class HtmlExport(FileExport):
     """HTML file representation.
@@ -72,33 +89,16 @@ strong {font-weight:normal; text-transform: uppercase}
         
         Overrides the superclass method.
         """
+        if not text:
+            return ''
+
         if quick:
             # Just clean up a one-liner without sophisticated formatting.
-            if text is None:
-                return ''
-            else:
-                return text
-
-        if text:
-            text = self._remove_inline_code(text)
-
-            # Apply html formatting.
-            HTML_REPLACEMENTS = [
-                ('\n', '</p>\n<p>'),
-                ('[i]', '<em>'),
-                ('[/i]', '</em>'),
-                ('[b]', '<strong>'),
-                ('[/b]', '</strong>'),
-                ('<p></p>', '<p><br /></p>'),
-                ('/*', '<!--'),
-                ('*/', '-->'),
-            ]
-            for yw, htm in HTML_REPLACEMENTS:
-                text = text.replace(yw, htm)
-
-            # Remove highlighting, alignment,
-            # strikethrough, and underline tags.
-            text = re.sub(r'\[\/*[h|c|r|s|u]\d*\]', '', text)
-        else:
-            text = ''
+            return text
+
+        text = self._remove_inline_code(text)
+
+        # Apply html formatting.
+        text = text.replace('\n', '</p>\n<p>')
+        text = YW_MARKUP.sub(lambda m: HTML_REPLACEMENTS.get(m.group(), ''), text)
         return(text)
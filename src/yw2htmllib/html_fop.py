@@ -4,6 +4,7 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+import locale
 from pywriter.pywriter_globals import *
 
 
@@ -14,14 +15,23 @@ def read_html_file(filePath):
     Raise the "Error" exception in case of error. 
     """
     try:
-        with open(filePath, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except:
+        with open(filePath, 'rb', buffering=0) as f:
+            data = f.read()
+            # The file is read at once, so no read buffer is needed.
+    except(FileNotFoundError):
+        raise Error(f'{_("File not found")}: "{norm_path(filePath)}".')
+
+    # The file is read only once; if it is not utf-8, the bytes are decoded again.
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError:
         # HTML files exported by a word processor may be ANSI encoded.
         try:
-            with open(filePath, 'r') as f:
-                content = (f.read())
-        except(FileNotFoundError):
-            raise Error(f'{_("File not found")}: "{norm_path(filePath)}".')
-
+            content = data.decode(locale.getpreferredencoding(False))
+        except UnicodeDecodeError:
+            # The system's preferred encoding is utf-8 as well, so assume a Windows code page.
+            content = data.decode('cp1252', errors='replace')
+    if '\r' in content:
+        # Translate the line breaks like a file opened in text mode.
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
     return content
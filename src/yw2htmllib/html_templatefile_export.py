@@ -4,9 +4,143 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/yw2html
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+import os
+from functools import lru_cache
 from yw2htmllib.html_fop import read_html_file
 from yw2htmllib.html_export import HtmlExport
 
+ROMAN = [
+    (1000, "M"),
+    (900, "CM"),
+    (500, "D"),
+    (400, "CD"),
+    (100, "C"),
+    (90, "XC"),
+    (50, "L"),
+    (40, "XL"),
+    (10, "X"),
+    (9, "IX"),
+    (5, "V"),
+    (4, "IV"),
+    (1, "I"),
+]
+
+
+@lru_cache(maxsize=None)
+def number_to_roman(n):
+    """Return n as a Roman number.
+    
+    Credit goes to the user 'Aristide' on stack overflow.
+    https://stackoverflow.com/a/47713392
+    """
+    result = []
+    for (arabic, roman) in ROMAN:
+        (factor, n) = divmod(n, arabic)
+        result.append(roman * factor)
+        if n == 0:
+            break
+
+    return "".join(result)
+
+
+TENS = {30: 'thirty', 40: 'forty', 50: 'fifty',
+        60: 'sixty', 70: 'seventy', 80: 'eighty', 90: 'ninety'}
+ZERO_TO_TWENTY = (
+    'zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+    'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen', 'twenty'
+)
+
+
+@lru_cache(maxsize=None)
+def number_to_english(n):
+    """Return n as a number written out in English.
+
+    Credit goes to the user 'Hunter_71' on stack overflow.
+    https://stackoverflow.com/a/51849443
+    """
+    if not isinstance(n, int) or n < 0:
+        return ''
+
+    if n <= 20:
+        return ZERO_TO_TWENTY[n]
+
+    elif n < 100 and n % 10 == 0:
+        return TENS[n]
+
+    elif n < 100:
+        return f'{number_to_english(n - (n % 10))} {number_to_english(n % 10)}'
+
+    elif n < 1000 and n % 100 == 0:
+        return f'{number_to_english(n // 100)} hundred'
+
+    elif n < 1000:
+        return f'{number_to_english(n // 100)} hundred {number_to_english(n % 100)}'
+
+    elif n < 1000000 and n % 1000 == 0:
+        return f'{number_to_english(n // 1000)} thousand'
+
+    elif n < 1000000:
+        return f'{number_to_english(n // 1000)} thousand {number_to_english(n % 1000)}'
+
+    return ''
+
+
+templateCache = {}
+# key: str -- template file path
+# value: (file status, template) tuple; the status is (modification time, size).
+
+
+def load_templates(templatePath, templates, extension):
+    """Return a tuple of (instance variable, template) pairs read from templatePath.
+    
+    Positional arguments:
+        templatePath: str -- template directory path.
+        templates -- tuple of (template name, instance variable) pairs.
+        extension: str -- template file extension.
+    
+    The templates are cached; a file is read again only if it has changed.
+    """
+
+    def load_template(filePath):
+        try:
+            return read_html_file(filePath)
+        except:
+            return None
+
+    # Look up the existing files at once instead of probing for each template.
+    templateFiles = {}
+    try:
+        with os.scandir(templatePath) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        fileStat = entry.stat()
+                        templateFiles[os.path.normcase(entry.name)] = (fileStat.st_mtime_ns, fileStat.st_size)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    loadedTemplates = []
+    for templateName, templateAttribute in templates:
+        fileName = f'{templateName}{extension}'
+        fileStatus = templateFiles.get(os.path.normcase(fileName))
+        if fileStatus is None:
+            continue
+
+        filePath = f'{templatePath}/{fileName}'
+        cachedTemplate = templateCache.get(filePath)
+        if cachedTemplate is None or cachedTemplate[0] != fileStatus:
+            content = load_template(filePath)
+            if content is None:
+                templateCache.pop(filePath, None)
+                continue
+
+            templateCache[filePath] = (fileStatus, content)
+        else:
+            content = cachedTemplate[1]
+        loadedTemplates.append((templateAttribute, content))
+    return tuple(loadedTemplates)
+
 
 class HtmlTemplatefileExport(HtmlExport):
     """Export content or metadata from a yWriter project to a HTML file.
@@ -15,6 +149,7 @@ class HtmlTemplatefileExport(HtmlExport):
         write() -- write instance variables to the export file.
     
     Read the templates from external HTML flies.
+    The templates are cached; modified template files are read again.
     """
 
     # Reset default templates.
@@ -48,6 +183,35 @@ class HtmlTemplatefileExport(HtmlExport):
     _SCENE_DIVIDER = 'scene_divider'
     _TEMPLATE_CHAPTER_TITLE = 'html templates'
 
+    _TEMPLATES = (
+        # Project level.
+        (_HTML_HEADER, '_fileHeader'),
+        (_CHARACTER_TEMPLATE, '_characterTemplate'),
+        (_LOCATION_TEMPLATE, '_locationTemplate'),
+        (_ITEM_TEMPLATE, '_itemTemplate'),
+        (_HTML_FOOTER, '_fileFooter'),
+
+        # Chapter level.
+        (_PART_TEMPLATE, '_partTemplate'),
+        (_CHAPTER_TEMPLATE, '_chapterTemplate'),
+        (_CHAPTER_END_TEMPLATE, '_chapterEndTemplate'),
+        (_UNUSED_CHAPTER_TEMPLATE, '_unusedChapterTemplate'),
+        (_UNUSED_CHAPTER_END_TEMPLATE, '_unusedChapterEndTemplate'),
+        (_NOTES_CHAPTER_TEMPLATE, '_notesChapterTemplate'),
+        (_NOTES_CHAPTER_END_TEMPLATE, '_notesChapterEndTemplate'),
+        (_TODO_CHAPTER_TEMPLATE, '_todoChapterTemplate'),
+        (_TODO_CHAPTER_END_TEMPLATE, '_todoChapterEndTemplate'),
+
+        # Scene level.
+        (_SCENE_TEMPLATE, '_sceneTemplate'),
+        (_FIRST_SCENE_TEMPLATE, '_firstSceneTemplate'),
+        (_UNUSED_SCENE_TEMPLATE, '_unusedSceneTemplate'),
+        (_NOTES_SCENE_TEMPLATE, '_notesSceneTemplate'),
+        (_TODO_SCENE_TEMPLATE, '_todoSceneTemplate'),
+        (_SCENE_DIVIDER, '_sceneDivider'),
+    )
+    # Template names and the instance variables holding the templates
+
     def __init__(self, filePath, **kwargs):
         """Read templates from files, if any.
 
@@ -59,82 +223,11 @@ class HtmlTemplatefileExport(HtmlExport):
         
         Extends the superclass constructor.
         """
-
-        def load_template(filePath):
-            try:
-                return read_html_file(filePath)
-            except:
-                return None
-
         super().__init__(filePath)
-        templatePath = kwargs['template_path']
-
-        # Project level.
-        content = load_template(f'{templatePath}/{self._HTML_HEADER}{self.EXTENSION}')
-        if content is not None:
-            self._fileHeader = content
-        content = load_template(f'{templatePath}/{self._CHARACTER_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._characterTemplate = content
-        content = load_template(f'{templatePath}/{self._LOCATION_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._locationTemplate = content
-        content = load_template(f'{templatePath}/{self._ITEM_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._itemTemplate = content
-        content = load_template(f'{templatePath}/{self._HTML_FOOTER}{self.EXTENSION}')
-        if content is not None:
-            self._fileFooter = content
-
-        # Chapter level.
-        content = load_template(f'{templatePath}/{self._PART_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._partTemplate = content
-        content = load_template(f'{templatePath}/{self._CHAPTER_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._chapterTemplate = content
-        content = load_template(f'{templatePath}/{self._CHAPTER_END_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._chapterEndTemplate = content
-        content = load_template(f'{templatePath}/{self._UNUSED_CHAPTER_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._unusedChapterTemplate = content
-        content = load_template(f'{templatePath}/{self._UNUSED_CHAPTER_END_TEMPLATE}{self.EXTENSION}')
-
-        if content is not None:
-            self._unusedChapterEndTemplate = content
-        content = load_template(f'{templatePath}/{self._NOTES_CHAPTER_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._notesChapterTemplate = content
-        content = load_template(f'{templatePath}/{self._NOTES_CHAPTER_END_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._notesChapterEndTemplate = content
-        content = load_template(f'{templatePath}/{self._TODO_CHAPTER_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._todoChapterTemplate = content
-        content = load_template(f'{templatePath}/{self._TODO_CHAPTER_END_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._todoChapterEndTemplate = content
-
-        # Scene level.
-        content = load_template(f'{templatePath}/{self._SCENE_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._sceneTemplate = content
-        content = load_template(f'{templatePath}/{self._FIRST_SCENE_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._firstSceneTemplate = content
-        content = load_template(f'{templatePath}/{self._UNUSED_SCENE_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._unusedSceneTemplate = content
-        content = load_template(f'{templatePath}/{self._NOTES_SCENE_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._notesSceneTemplate = content
-        content = load_template(f'{templatePath}/{self._TODO_SCENE_TEMPLATE}{self.EXTENSION}')
-        if content is not None:
-            self._todoSceneTemplate = content
-        content = load_template(f'{templatePath}/{self._SCENE_DIVIDER}{self.EXTENSION}')
-        if content is not None:
-            self._sceneDivider = content
+        templatePath = os.path.abspath(kwargs['template_path'])
+        # A relative path must not hit the cache after a change of the working directory.
+        for templateAttribute, content in load_templates(templatePath, self._TEMPLATES, self.EXTENSION):
+            setattr(self, templateAttribute, content)
 
     def _get_chapterMapping(self, chId, chapterNumber):
         """Return a mapping dictionary for a chapter section. 
@@ -145,73 +238,6 @@ class HtmlTemplatefileExport(HtmlExport):
 
         Extends the superclass method.
         """
-        ROMAN = [
-            (1000, "M"),
-            (900, "CM"),
-            (500, "D"),
-            (400, "CD"),
-            (100, "C"),
-            (90, "XC"),
-            (50, "L"),
-            (40, "XL"),
-            (10, "X"),
-            (9, "IX"),
-            (5, "V"),
-            (4, "IV"),
-            (1, "I"),
-        ]
-
-        def number_to_roman(n):
-            """Return n as a Roman number.
-            
-            Credit goes to the user 'Aristide' on stack overflow.
-            https://stackoverflow.com/a/47713392
-            """
-            result = []
-            for (arabic, roman) in ROMAN:
-                (factor, n) = divmod(n, arabic)
-                result.append(roman * factor)
-                if n == 0:
-                    break
-
-            return "".join(result)
-
-        TENS = {30: 'thirty', 40: 'forty', 50: 'fifty',
-                60: 'sixty', 70: 'seventy', 80: 'eighty', 90: 'ninety'}
-        ZERO_TO_TWENTY = (
-            'zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
-            'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen', 'twenty'
-        )
-
-        def number_to_english(n):
-            """Return n as a number written out in English.
-
-            Credit goes to the user 'Hunter_71' on stack overflow.
-            https://stackoverflow.com/a/51849443
-            """
-            if any(not x.isdigit() for x in str(n)):
-                return ''
-
-            if n <= 20:
-                return ZERO_TO_TWENTY[n]
-
-            elif n < 100 and n % 10 == 0:
-                return TENS[n]
-
-            elif n < 100:
-                return f'{number_to_english(n - (n % 10))} {number_to_english(n % 10)}'
-
-            elif n < 1000 and n % 100 == 0:
-                return f'{number_to_english(n / 100)} hundred'
-
-            elif n < 1000:
-                return f'{number_to_english(n / 100)} hundred {number_to_english(n % 100)}'
-
-            elif n < 1000000:
-                return f'{number_to_english(n / 1000)} thousand {number_to_english(n % 1000)}'
-
-            return ''
-
         chapterMapping = super()._get_chapterMapping(chId, chapterNumber)
         if chapterNumber:
             chapterMapping['ChNumberEnglish'] = number_to_english(chapterNumber).capitalize()
@@ -229,91 +255,19 @@ class HtmlTemplatefileExport(HtmlExport):
         Extends the superclass constructor.
         """
 
-        def get_template(scId, title):
-            """Retrieve a template from a yWriter scene.
-            
-            Return scene content if title matches. Otherwise return None.
-            """
-            if self.novel.scenes[scId].title == title:
-                content = self.novel.scenes[scId].sceneContent
-            else:
-                content = None
-            return content
+        templateAttributes = dict(self._TEMPLATES)
 
         # Find template chapter.
-        for chId in self.novel.chapters:
-            if self.novel.chapters[chId].chType != 3:
+        for chapter in self.novel.chapters.values():
+            if chapter.chType != 3:
                 continue
 
-            if self.novel.chapters[chId].title != self._TEMPLATE_CHAPTER_TITLE:
+            if chapter.title != self._TEMPLATE_CHAPTER_TITLE:
                 continue
 
-            for scId in self.novel.chapters[chId].srtScenes:
-
-                # Project level.
-                content = get_template(scId, self._HTML_HEADER)
-                if content is not None:
-                    self._fileHeader = content
-                content = get_template(scId, self._CHARACTER_TEMPLATE)
-                if content is not None:
-                    self._characterTemplate = content
-                content = get_template(scId, self._LOCATION_TEMPLATE)
-                if content is not None:
-                    self._locationTemplate = content
-                content = get_template(scId, self._ITEM_TEMPLATE)
-                if content is not None:
-                    self._itemTemplate = content
-                content = get_template(scId, self._HTML_FOOTER)
-                if content is not None:
-                    self._fileFooter = content
-
-                # Chapter level.
-
-                content = get_template(scId, self._PART_TEMPLATE)
-                if content is not None:
-                    self._partTemplate = content
-                content = get_template(scId, self._CHAPTER_TEMPLATE)
-                if content is not None:
-                    self._chapterTemplate = content
-                content = get_template(scId, self._CHAPTER_END_TEMPLATE)
-                if content is not None:
-                    self._chapterEndTemplate = content
-                content = get_template(scId, self._UNUSED_CHAPTER_TEMPLATE)
-                if content is not None:
-                    self._unusedChapterTemplate = content
-                content = get_template(scId, self._UNUSED_CHAPTER_END_TEMPLATE)
-                if content is not None:
-                    self._unusedChapterEndTemplate = content
-                content = get_template(scId, self._NOTES_CHAPTER_TEMPLATE)
-                if content is not None:
-                    self._notesChapterTemplate = content
-                content = get_template(scId, self._NOTES_CHAPTER_END_TEMPLATE)
-                if content is not None:
-                    self._notesChapterEndTemplate = content
-                content = get_template(scId, self._TODO_CHAPTER_TEMPLATE)
-                if content is not None:
-                    self._todoChapterTemplate = content
-                content = get_template(scId, self._TODO_CHAPTER_END_TEMPLATE)
-                if content is not None:
-                    self._todoChapterEndTemplate = content
-
-                # Scene level.
-                content = get_template(scId, self._SCENE_TEMPLATE)
-                if content is not None:
-                    self._sceneTemplate = content
-                content = get_template(scId, self._FIRST_SCENE_TEMPLATE)
-                if content is not None:
-                    self._firstSceneTemplate = content
-                content = get_template(scId, self._UNUSED_SCENE_TEMPLATE)
-                if content is not None:
-                    self._unusedSceneTemplate = content
-                content = get_template(scId, self._NOTES_SCENE_TEMPLATE)
-                if content is not None:
-                    self._notesSceneTemplate = content
-                content = get_template(scId, self._TODO_SCENE_TEMPLATE)
-                if content is not None:
-                    self._todoSceneTemplate = content
-                content = get_template(scId, self._SCENE_DIVIDER)
-                if content is not None:
-                    self._sceneDivider = content
+            for scId in chapter.srtScenes:
+                scene = self.novel.scenes[scId]
+                templateAttribute = templateAttributes.get(scene.title)
+                if templateAttribute is not None and scene.sceneContent is not None:
+                    setattr(self, templateAttribute, scene.sceneContent)
         super().write()
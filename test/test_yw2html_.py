@@ -8,6 +8,10 @@ import os
 import unittest
 import yw2html_
 from shutil import copyfile
+from string import Template
+from pywriter.file.format_template import FormatTemplate
+from yw2htmllib.html_templatefile_export import number_to_english
+from yw2htmllib.html_fop import read_html_file
 
 # Test environment
 
@@ -29,6 +33,9 @@ SCENELIST = 'normal_scenelist.html'
 SCRIPT = 'normal_manuscript.html'
 CHARAS = 'normal_characters.html'
 
+# Written by the test
+ANSI_TEMPLATE = 'ansi_template.html'
+
 
 def read_file(inputFile):
     try:
@@ -61,6 +68,10 @@ def remove_all_testfiles():
         os.remove(TEST_EXEC_PATH + PAPERBACK)
     except:
         pass
+    try:
+        os.remove(TEST_EXEC_PATH + ANSI_TEMPLATE)
+    except:
+        pass
 
 
 class NormalOperation(unittest.TestCase):
@@ -103,6 +114,56 @@ class NormalOperation(unittest.TestCase):
         remove_all_testfiles()
 
 
+class ChapterNumbers(unittest.TestCase):
+    """Test case: Chapter numbers written out in English."""
+
+    def test_hundreds(self):
+        self.assertEqual(number_to_english(100), 'one hundred')
+        self.assertEqual(number_to_english(101), 'one hundred one')
+        self.assertEqual(number_to_english(150), 'one hundred fifty')
+        self.assertEqual(number_to_english(999), 'nine hundred ninety nine')
+
+    def test_thousands(self):
+        self.assertEqual(number_to_english(1000), 'one thousand')
+        self.assertEqual(number_to_english(2000), 'two thousand')
+        self.assertEqual(number_to_english(1001), 'one thousand one')
+        self.assertEqual(number_to_english(1150), 'one thousand one hundred fifty')
+
+
+class FormatTemplateSubstitution(unittest.TestCase):
+    """Test case: FormatTemplate behaves like string.Template."""
+
+    def test_safe_substitute(self):
+        mapping = dict(Title='A & B', Desc='{description}')
+        templates = [
+            'Price: $$5 for $Title',
+            'A stray $ and a trailing $',
+            '${Title} and ${Missing}, $Missing',
+            'Literal {} and {Title} around $Desc',
+            '${Title}$$$Title$',
+        ]
+        for template in templates:
+            expected = Template(template).safe_substitute(mapping)
+            self.assertEqual(FormatTemplate(template).safe_substitute(mapping), expected)
+            self.assertEqual(FormatTemplate(template).safe_substitute({}), Template(template).safe_substitute({}))
+
+
+class AnsiTemplate(unittest.TestCase):
+    """Test case: Template file not being encoded utf-8."""
+
+    def setUp(self):
+        os.makedirs(TEST_EXEC_PATH, exist_ok=True)
+        remove_all_testfiles()
+        with open(TEST_EXEC_PATH + ANSI_TEMPLATE, 'wb') as f:
+            f.write('<p>Grüße, $Title</p>\r\n'.encode('cp1252'))
+
+    def test_read_html_file(self):
+        self.assertEqual(read_html_file(TEST_EXEC_PATH + ANSI_TEMPLATE), '<p>Grüße, $Title</p>\n')
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
 def main():
     unittest.main()
 
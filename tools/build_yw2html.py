@@ -18,10 +18,8 @@ TARGET_FILE = f'{BUILD}yw2html.py'
 
 
 def main():
-    inliner.run(SOURCE_FILE, TARGET_FILE, 'yw2htmllib', '../src/')
-    inliner.run(TARGET_FILE, TARGET_FILE, 'pywriter', '../src/')
-    # inliner.run(SOURCE_FILE, TARGET_FILE, 'yw2htmllib', '../src/', copyPyWriter=True)
-    # inliner.run(TARGET_FILE, TARGET_FILE, 'pywriter', '../../PyWriter/src/', copyPyWriter=True)
+    inliner.run(SOURCE_FILE, TARGET_FILE, [('yw2htmllib', '../src/'), ('pywriter', '../src/')])
+    # inliner.run(SOURCE_FILE, TARGET_FILE, [('yw2htmllib', '../src/'), ('pywriter', '../../PyWriter/src/')], copyPyWriter=True)
     print('Done.')
 
 
@@ -7,74 +7,137 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-import re
 import os
+from pathlib import Path
 from shutil import copyfile
 
 
-def inline_module(file, package, packagePath, text, processedModules, copyPyWriter):
-    with open(file, 'r', encoding='utf-8') as f:
-        print(f'Processing "{file}"...')
-        if copyPyWriter:
-            target = file.replace('/../PyWriter', '')
-            targetDir = os.path.split(target)[0]
-            os.makedirs(targetDir, exist_ok=True)
-            if not os.path.isfile(target):
-                copyfile(file, target)
-        lines = f.readlines()
-        inSuppressedComment = False
-        inHeader = True
-        # document parsing always starts in the header
-        for line in lines:
-            if line.startswith('# do_not_inline'):
+def read_lines(file):
+    """Return the lines of a utf-8 encoded file."""
+    return Path(file).read_text(encoding='utf-8').splitlines(keepends=True)
+
+
+def get_package_path(path, packages):
+    """Return the path of the first package occurring in path, or None."""
+    for package, packagePath in packages:
+        if package in path:
+            return packagePath
+
+    return None
+
+
+def inline_lines(lines, isSubmodule, packages, textLines, processedModules, copyPyWriter):
+    """Append the processed lines to textLines, inlining the package imports.
+    
+    Return False if the rest of the module is not to be inlined.
+    """
+    for line in lines:
+        if line.startswith('# do_not_inline'):
+            return False
+
+        stripped = line.lstrip()
+        if not stripped or stripped[0] == '#':
+            # Blank line or comment.
+            textLines.append(line)
+            continue
+
+        if isSubmodule:
+            if 'main()' in line:
+                return False
+
+            if '__main__' in line:
+                return False
+
+        if line.startswith('from '):
+            # e.g. "from pywriter.model.novel import Novel"
+            importPath = line.split(' ', 2)[1]
+            packagePath = get_package_path(importPath, packages)
+            if packagePath is not None and ' import ' in line:
+                moduleName = f'{packagePath}{importPath.replace(".", "/")}'
+                if not (moduleName in processedModules):
+                    processedModules.add(moduleName)
+                    inline_module(
+                        f'{moduleName}.py', packages, textLines, processedModules, copyPyWriter)
+                continue
+
+        elif stripped.startswith('import '):
+            importStatement = line.rstrip()
+            # The indentation is part of the key, so local imports are kept.
+            if importStatement in processedModules:
+                continue
+
+            processedModules.add(importStatement)
+        textLines.append(line)
+    return True
+
+
+def inline_module(file, packages, textLines, processedModules, copyPyWriter):
+    lines = read_lines(file)
+    print(f'Processing "{file}"...')
+    if copyPyWriter:
+        target = file.replace('/../PyWriter', '')
+        targetDir = os.path.split(target)[0]
+        os.makedirs(targetDir, exist_ok=True)
+        if not os.path.isfile(target):
+            copyfile(file, target)
+    isSubmodule = get_package_path(file, packages) is not None
+    # If this is not the root script, the module's docstring is suppressed.
+
+    # Document parsing always starts in the header.
+    lineIter = iter(lines)
+    headerLines = []
+    inDocstring = False
+    for line in lineIter:
+        if '"""' in line and line.count('"""') == 1:
+            # docstring begins
+            inDocstring = True
+            break
+
+        headerLines.append(line)
+    if not inline_lines(headerLines, isSubmodule, packages, textLines, processedModules, copyPyWriter):
+        return
+
+    if inDocstring:
+        if not isSubmodule:
+            textLines.append(line)
+        for line in lineIter:
+            if not isSubmodule:
+                textLines.append(line)
+            if '"""' in line and line.count('"""') == 1:
+                # docstring ends
                 break
 
-            if (inHeader) and line.count('"""') == 1:
-                # Beginning or end of a docstring
-                if package in file:
-                    # This is not the root script
-                    # so suppress the module's docstring
-                    if inSuppressedComment:
-                        # docstring ends
-                        inSuppressedComment = False
-                        inHeader = False
-                    else:
-                        # docstring begins
-                        inSuppressedComment = True
-                else:
-                    text = f'{text}{line}'
-            elif not inSuppressedComment:
-                if package in file:
-                    if 'main()' in line:
-                        return(text)
-                    if '__main__' in line:
-                        return(text)
-                if 'import' in line:
-                    importModule = re.match(r'from (.+?) import.+', line)
-                    if (importModule is not None) and (package in importModule.group(1)):
-                        packageName = re.sub(r'\.', '\/', importModule.group(1))
-                        moduleName = f'{packagePath}{packageName}'
-                        if not (moduleName in processedModules):
-                            processedModules.append(moduleName)
-                            text = inline_module(
-                                f'{moduleName}.py', package, packagePath, text, processedModules, copyPyWriter)
-                    elif line.lstrip().startswith('import'):
-                        moduleName = line.replace('import ', '').rstrip()
-                        if not (moduleName in processedModules):
-                            processedModules.append(moduleName)
-                            text = f'{text}{line}'
-                    else:
-                        text = f'{text}{line}'
-                else:
-                    text = f'{text}{line}'
-        return(text)
-
-
-def run(sourceFile, targetFile, package, packagePath, copyPyWriter=False):
-    text = ''
-    processedModules = []
-    text = inline_module(sourceFile, package, packagePath, text, processedModules, copyPyWriter)
-    with open(targetFile, 'w', encoding='utf-8') as f:
-        print(f'Writing "{targetFile}"...\n')
-        f.write(text)
+    # Process the module body.
+    inline_lines(lineIter, isSubmodule, packages, textLines, processedModules, copyPyWriter)
+
+
+def check_classes(textLines):
+    """Warn about top-level classes defined more than once in the inlined script."""
+    classNames = set()
+    for line in textLines:
+        if line.startswith('class '):
+            className = line[6:].split('(', 1)[0].split(':', 1)[0].strip()
+            if className in classNames:
+                print(f'WARNING: Class "{className}" is defined more than once.')
+            classNames.add(className)
+
+
+def run(sourceFile, targetFile, packages, copyPyWriter=False):
+    """Write sourceFile to targetFile, inlining the modules of all packages.
+    
+    Positional arguments:
+        sourceFile: str -- path to the root script.
+        targetFile: str -- path to the script to be written.
+        packages -- list of (package name, path to the package's parent directory) tuples.
+    """
+    textLines = []
+    processedModules = set()
+    inline_module(sourceFile, packages, textLines, processedModules, copyPyWriter)
+    check_classes(textLines)
+    text = ''.join(textLines)
+    print(f'Writing "{targetFile}"...\n')
+    tempFile = f'{targetFile}.tmp'
+    Path(tempFile).write_text(text, encoding='utf-8')
+    os.replace(tempFile, targetFile)
+    # The target file is never left half-written.
 